@@ -4,6 +4,9 @@ import numpy as np
 import pandas as pd
 import scipy.sparse as sp
 import h5py
+from anndata.io import write_elem
+
+rng = np.random.default_rng(42)
 
 # Create test data with layers
 n_obs = 100
@@ -11,40 +14,62 @@ n_var = 50
 
 # Create base AnnData object
 obs = pd.DataFrame({
-    'cell_type': np.random.choice(['T cell', 'B cell', 'NK cell'], n_obs),
-    'n_genes': np.random.randint(100, 1000, n_obs)
-}, index=[f'Cell_{i:03d}' for i in range(n_obs)])
+    'cell_type': rng.choice(['T cell', 'B cell', 'NK cell'], n_obs),
+    'n_genes': rng.integers(100, 1000, n_obs)
+}, index=pd.Index(np.char.mod('Cell_%03d', np.arange(n_obs))))
 
 var = pd.DataFrame({
-    'gene_id': [f'ENSG{i:011d}' for i in range(n_var)],
-    'gene_name': [f'Gene_{i:03d}' for i in range(n_var)],
-    'highly_variable': np.random.choice([True, False], n_var)
-}, index=[f'Gene_{i:03d}' for i in range(n_var)])
+    'gene_id': np.char.mod('ENSG%011d', np.arange(n_var)),
+    'gene_name': np.char.mod('Gene_%03d', np.arange(n_var)),
+    'highly_variable': rng.choice([True, False], n_var)
+}, index=pd.Index(np.char.mod('Gene_%03d', np.arange(n_var))))
 
 # Main X matrix (normalized data)
-X = np.random.randn(n_obs, n_var).astype(np.float32)
+X = rng.standard_normal((n_obs, n_var), dtype=np.float32)
 
 adata = ad.AnnData(X=X, obs=obs, var=var)
 
-# Add layers with different data types and sparsity
-# Raw counts (integer, sparse)
-raw_counts = np.random.poisson(5, size=(n_obs, n_var))
-adata.layers['raw_counts'] = sp.csr_matrix(raw_counts)
+# Add layers with different data types and sparsity.
+# Derive every layer from raw_counts up front, then wrap/assign them together.
+# (int32 as anndata_layers.test documents; the checked-in test_layers.h5ad still stores int64)
+raw_counts = rng.poisson(5, size=(n_obs, n_var)).astype(np.int32)
+# Log normalized - cast the input so log1p runs in float32
+log_norm = np.log1p(raw_counts.astype(np.float32, copy=False))
+binary = (raw_counts > 5).astype(np.int32)
 
-# Log normalized (float32, dense)
-log_norm = np.log1p(raw_counts).astype(np.float32)
-adata.layers['log_norm'] = log_norm
+# Scaled data - standardize in place in a single float64 buffer
+mean = X.mean(axis=0, keepdims=True, dtype=np.float64)
+std = X.std(axis=0, keepdims=True, dtype=np.float64)
+scaled = np.empty((n_obs, n_var), dtype=np.float64)
+np.subtract(X, mean, out=scaled)
+np.divide(scaled, std, out=scaled)
 
-# Scaled data (float64, dense)
-scaled = (X - X.mean(axis=0)) / X.std(axis=0)
-adata.layers['scaled'] = scaled.astype(np.float64)
+adata.layers['raw_counts'] = sp.csr_matrix(raw_counts)  # int32, sparse
+adata.layers['log_norm'] = log_norm  # float32, dense
+adata.layers['scaled'] = scaled  # float64, dense
+adata.layers['binary'] = sp.csc_matrix(binary)  # int32, sparse
 
-# Binary data (int32, sparse)
-binary = (raw_counts > 5).astype(np.int32)
-adata.layers['binary'] = sp.csc_matrix(binary)
-
-# Save the file
-adata.write_h5ad('test/data/test_layers.h5ad')
+# Save the file. Elements are written one by one so the dense matrices can be
+# chunked in row blocks spanning every column: the extension scans X and layers
+# in obs-row batches over all vars, so each batch then touches a single chunk.
+# The checked-in test_layers.h5ad predates this (it is not regenerated, see
+# test/README.md), so the SQL tests do not yet exercise the chunked dense reads.
+dense_kwargs = {'chunks': (min(n_obs, 512), n_var), 'compression': None}
+adata.strings_to_categoricals()  # as write_h5ad does
+with h5py.File('test/data/test_layers.h5ad', 'w') as f:
+    f.attrs['encoding-type'] = 'anndata'
+    f.attrs['encoding-version'] = '0.1.0'
+    write_elem(f, 'X', adata.X, dataset_kwargs=dense_kwargs)
+    write_elem(f, 'obs', adata.obs)
+    write_elem(f, 'var', adata.var)
+    for key in ['obsm', 'varm', 'obsp', 'varp', 'uns']:
+        write_elem(f, key, dict(getattr(adata, key)))
+    layers = f.create_group('layers')
+    layers.attrs['encoding-type'] = 'dict'
+    layers.attrs['encoding-version'] = '0.1.0'
+    for name in ['raw_counts', 'log_norm', 'scaled', 'binary']:
+        layer = adata.layers[name]
+        write_elem(layers, name, layer, dataset_kwargs={} if sp.issparse(layer) else dense_kwargs)
 
 # Print layer information
 print("Created test_layers.h5ad with layers:")
@@ -54,17 +79,6 @@ for name, layer in adata.layers.items():
     else:
         print(f"  {name}: shape={layer.shape}, dtype={layer.dtype}, dense")
 
-# Inspect HDF5 structure
-print("\nHDF5 structure:")
-with h5py.File('test/data/test_layers.h5ad', 'r') as f:
-    def print_structure(name, obj):
-        if isinstance(obj, h5py.Group):
-            print(f"  Group: {name}")
-        elif isinstance(obj, h5py.Dataset):
-            print(f"  Dataset: {name}, shape={obj.shape}, dtype={obj.dtype}")
-    
-    f.visititems(print_structure)
-
 # Print sample values for verification
 print("\nSample values for testing:")
 print(f"raw_counts[0,0] = {adata.layers['raw_counts'][0, 0]}")
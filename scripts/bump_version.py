@@ -46,6 +46,9 @@ def bump_version(version: str, bump_type: str) -> str:
 def update_version_in_files(old_version: str, new_version: str):
     """Update version in all relevant files."""
     # Only VERSION file needs to be updated now - everything else reads from it
+    if new_version == old_version:
+        print(f"VERSION file already at {new_version}")
+        return
     version_file = Path("VERSION")
     version_file.write_text(new_version)
     print(f"Updated VERSION file: {old_version} → {new_version}")
@@ -76,16 +79,20 @@ and this project adheres to [Semantic Versioning](https://semver.org/spec/v2.0.0
 """)
         print(f"Created CHANGELOG.md with version {new_version}")
     else:
-        content = changelog_path.read_text()
-        
-        # Check if version already exists
-        if f"## [{new_version}]" in content:
-            print(f"Version {new_version} already in CHANGELOG.md")
-            return
-        
-        # Add new version section after [Unreleased]
-        unreleased_pattern = r'## \[Unreleased\]'
-        if re.search(unreleased_pattern, content):
+        with changelog_path.open("r+", encoding="utf-8") as fh:
+            content = fh.read()
+            
+            # Check if version already exists (leaving the file and its mtime alone)
+            if f"## [{new_version}]" in content:
+                print(f"Version {new_version} already in CHANGELOG.md")
+                return
+            
+            # Add new version section after [Unreleased]
+            unreleased_pattern = r'## \[Unreleased\]'
+            if not re.search(unreleased_pattern, content):
+                print("Warning: Could not find [Unreleased] section in CHANGELOG.md")
+                return
+            
             new_section = f"""## [Unreleased]
 
 ## [{new_version}] - {datetime.date.today().isoformat()}
@@ -106,22 +113,41 @@ and this project adheres to [Semantic Versioning](https://semver.org/spec/v2.0.0
                 content,
                 count=1
             )
-            changelog_path.write_text(new_content)
+            fh.seek(0)
+            fh.write(new_content)
+            fh.truncate()
             print(f"Added version {new_version} to CHANGELOG.md")
-        else:
-            print("Warning: Could not find [Unreleased] section in CHANGELOG.md")
+
+def tag_exists(tag_name: str) -> bool:
+    """Check for a tag by reading the ref store, without spawning git."""
+    git_dir = Path(".git")
+    if not git_dir.is_dir() or (git_dir / "reftable").exists():
+        # Worktrees/submodules (.git file) and the reftable backend: let git resolve it
+        result = subprocess.run(
+            ["git", "tag", "-l", tag_name],
+            capture_output=True,
+            text=True
+        )
+        return bool(result.stdout.strip())
+    
+    if (git_dir / "refs" / "tags" / tag_name).exists():
+        return True
+    
+    # Tags may also have been packed into .git/packed-refs
+    packed_refs = git_dir / "packed-refs"
+    if packed_refs.exists():
+        ref_name = f"refs/tags/{tag_name}"
+        for line in packed_refs.read_text().splitlines():
+            if line.split(" ", 1)[-1] == ref_name:
+                return True
+    return False
 
 def create_git_tag(version: str, push: bool = False):
     """Create and optionally push a git tag."""
     tag_name = f"v{version}"
     
     # Check if tag already exists
-    result = subprocess.run(
-        ["git", "tag", "-l", tag_name],
-        capture_output=True,
-        text=True
-    )
-    if result.stdout.strip():
+    if tag_exists(tag_name):
         print(f"Tag {tag_name} already exists")
         return
     
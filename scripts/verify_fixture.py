@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Print the HDF5 structure of generated test fixtures.
+
+The fixture generators in test/python only write their output; run this
+on demand to inspect what they produced.
+
+Usage:
+    python scripts/verify_fixture.py test/data/test_layers.h5ad
+    python scripts/verify_fixture.py test/data/*.h5ad
+"""
+
+import sys
+
+import h5py
+
+
+def describe(name: str, obj) -> None:
+    """Print one group or dataset, indented by its depth in the file."""
+    indent = "  " * name.count("/")
+    leaf = name.rsplit("/", 1)[-1]
+    if isinstance(obj, h5py.Group):
+        encoding = obj.attrs.get("encoding-type")
+        suffix = f" ({encoding.decode() if isinstance(encoding, bytes) else encoding})" if encoding else ""
+        print(f"  {indent}{leaf}: Group{suffix}")
+    elif isinstance(obj, h5py.Dataset):
+        print(f"  {indent}{leaf}: Dataset {obj.dtype} shape={obj.shape}")
+        if obj.dtype.names and obj.shape and obj.shape[0] > 0:
+            # Compound datasets (older AnnData obs/var layout)
+            print(f"  {indent}  fields: {list(obj.dtype.names)}")
+            print(f"  {indent}  first record: {obj[0]}")
+            print(f"  {indent}  last record: {obj[-1]}")
+
+
+def verify_fixture(path: str) -> None:
+    """Walk a fixture file and print every group and dataset in it."""
+    print(f"{path}:")
+    with h5py.File(path, "r") as f:
+        f.visititems(describe)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    for path in sys.argv[1:]:
+        verify_fixture(path)
+
+
+if __name__ == "__main__":
+    main()
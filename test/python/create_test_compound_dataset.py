@@ -8,6 +8,7 @@ per column.
 
 import h5py
 import numpy as np
+from fixture_utils import LIBVER, s_ids
 
 output_path = "test/data/test_compound_dataset.h5ad"
 
@@ -34,32 +35,34 @@ var_dtype = np.dtype(
     ]
 )
 
-with h5py.File(output_path, "w") as f:
+with h5py.File(output_path, "w", libver=LIBVER) as f:
     # X matrix (dense)
-    np.random.seed(42)
-    X_data = np.random.rand(n_obs, n_vars).astype(np.float32)
-    X = f.create_dataset("X", data=X_data)
+    # Legacy seeded stream, so regenerating reproduces the checked-in X
+    X_data = np.random.RandomState(42).rand(n_obs, n_vars).astype(np.float32)
+    # Tiny fixture: keep X contiguous rather than chunked
+    X = f.create_dataset("X", data=X_data, chunks=None)
     X.attrs["encoding-type"] = "array"
     X.attrs["encoding-version"] = "0.2.0"
 
     # Create obs as a compound dataset (older format)
+    # Fill column-wise rather than record-by-record
+    obs_i = np.arange(n_obs)
     obs_data = np.zeros(n_obs, dtype=obs_dtype)
-    for i in range(n_obs):
-        obs_data[i]['_index'] = f"cell_{i:04d}".encode('utf-8')
-        obs_data[i]['n_genes'] = 100 + i * 2
-        obs_data[i]['total_counts'] = 1000.0 + i * 50.5
-        obs_data[i]['pct_mito'] = 0.5 + i * 0.1
+    obs_data['_index'] = s_ids(b'cell_', n_obs, 4)
+    obs_data['n_genes'] = 100 + obs_i * 2
+    obs_data['total_counts'] = 1000.0 + obs_i * 50.5
+    obs_data['pct_mito'] = 0.5 + obs_i * 0.1
 
     obs_ds = f.create_dataset("obs", data=obs_data)
     # Note: No encoding-type attribute for compound datasets in older format
 
     # Create var as a compound dataset (older format)
+    var_i = np.arange(n_vars)
     var_data = np.zeros(n_vars, dtype=var_dtype)
-    for i in range(n_vars):
-        var_data[i]['_index'] = f"ENSG{i:08d}".encode('utf-8')
-        var_data[i]['gene_name'] = f"Gene{i}".encode('utf-8')
-        var_data[i]['n_cells'] = 10 + i * 3
-        var_data[i]['mean_expr'] = 0.1 + i * 0.05
+    var_data['_index'] = s_ids(b'ENSG', n_vars, 8)
+    var_data['gene_name'] = s_ids(b'Gene', n_vars)
+    var_data['n_cells'] = 10 + var_i * 3
+    var_data['mean_expr'] = 0.1 + var_i * 0.05
 
     var_ds = f.create_dataset("var", data=var_data)
 
@@ -70,30 +73,3 @@ with h5py.File(output_path, "w") as f:
         grp.attrs["encoding-version"] = "0.1.0"
 
 print(f"Created {output_path}")
-
-# Verify the structure
-with h5py.File(output_path, "r") as f:
-    print("\nFile structure:")
-    print(f"  /X: {f['X'].dtype} shape={f['X'].shape}")
-
-    obs = f['obs']
-    print(f"\n  /obs: {type(obs).__name__}")
-    if isinstance(obs, h5py.Dataset):
-        print(f"    dtype: {obs.dtype}")
-        print(f"    shape: {obs.shape}")
-        print(f"    fields: {list(obs.dtype.names)}")
-        print(f"    First record: {obs[0]}")
-        print(f"    Last record: {obs[-1]}")
-    else:
-        print("    ERROR: /obs is not a Dataset!")
-
-    var = f['var']
-    print(f"\n  /var: {type(var).__name__}")
-    if isinstance(var, h5py.Dataset):
-        print(f"    dtype: {var.dtype}")
-        print(f"    shape: {var.shape}")
-        print(f"    fields: {list(var.dtype.names)}")
-        print(f"    First record: {var[0]}")
-        print(f"    Last record: {var[-1]}")
-    else:
-        print("    ERROR: /var is not a Dataset!")
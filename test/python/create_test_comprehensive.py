@@ -11,7 +11,24 @@ from scipy import sparse
 import os
 
 # Set seed for reproducibility
-np.random.seed(42)
+# Legacy seeded stream: test/sql/remote/http_basic.test asserts the cell types it produces
+rs = np.random.RandomState(42)
+
+
+def fast_random_csr(n_rows, n_cols, density, dtype):
+    """Build a random CSR matrix directly from flat positions, skipping the COO round-trip.
+
+    Draws the same positions and values as ``sparse.random(..., random_state=rs)``,
+    which ravels positions in column-major order.
+    """
+    nnz = int(round(n_rows * n_cols * density))
+    cols, rows = np.divmod(rs.choice(n_rows * n_cols, nnz, replace=False), n_rows)
+    data = rs.uniform(size=nnz).astype(dtype)
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return sparse.csr_matrix((data[order], cols[order], indptr), shape=(n_rows, n_cols))
+
 
 # Dimensions
 n_obs = 100
@@ -19,59 +36,62 @@ n_vars = 50
 
 # Create sparse X matrix (CSR format)
 density = 0.3
-X = sparse.random(n_obs, n_vars, density=density, format='csr', dtype=np.float32)
-X.data = np.abs(X.data) * 10  # Make values positive counts
+X = fast_random_csr(n_obs, n_vars, density, np.float32)
+# Make values positive counts, in place on the nnz array
+np.abs(X.data, out=X.data)
+X.data *= 10
 
 # Create obs DataFrame with categorical and numeric columns
 cell_types = ['T cell', 'B cell', 'Monocyte', 'NK cell', 'Dendritic']
 obs = pd.DataFrame(
     {
-        'cell_type': pd.Categorical(np.random.choice(cell_types, n_obs)),
-        'n_counts': np.random.randint(1000, 10000, n_obs),
-        'n_genes': np.random.randint(100, 500, n_obs),
-        'percent_mito': np.random.uniform(0, 0.1, n_obs),
-        'batch': pd.Categorical(np.random.choice(['batch1', 'batch2', 'batch3'], n_obs)),
+        'cell_type': pd.Categorical(rs.choice(cell_types, n_obs)),
+        'n_counts': rs.randint(1000, 10000, n_obs),
+        'n_genes': rs.randint(100, 500, n_obs),
+        'percent_mito': rs.uniform(0, 0.1, n_obs),
+        'batch': pd.Categorical(rs.choice(['batch1', 'batch2', 'batch3'], n_obs)),
     },
-    index=[f'cell_{i}' for i in range(n_obs)],
+    index=pd.Index(np.char.mod('cell_%d', np.arange(n_obs))),
 )
 
 # Create var DataFrame with categorical and numeric columns
 gene_types = ['protein_coding', 'lncRNA', 'miRNA', 'pseudogene']
 var = pd.DataFrame(
     {
-        'gene_name': [f'Gene_{i}' for i in range(n_vars)],
-        'gene_type': pd.Categorical(np.random.choice(gene_types, n_vars)),
-        'chromosome': pd.Categorical(np.random.choice([f'chr{i}' for i in range(1, 23)], n_vars)),
-        'start': np.random.randint(1000000, 100000000, n_vars),
-        'end': np.random.randint(1000000, 100000000, n_vars),
-        'highly_variable': np.random.choice([True, False], n_vars),
+        'gene_name': np.char.mod('Gene_%d', np.arange(n_vars)),
+        'gene_type': pd.Categorical(rs.choice(gene_types, n_vars)),
+        'chromosome': pd.Categorical(rs.choice(np.char.mod('chr%d', np.arange(1, 23)), n_vars)),
+        'start': rs.randint(1000000, 100000000, n_vars),
+        'end': rs.randint(1000000, 100000000, n_vars),
+        'highly_variable': rs.choice([True, False], n_vars),
     },
-    index=[f'ENSG{i:08d}' for i in range(n_vars)],
+    index=pd.Index(np.char.mod('ENSG%08d', np.arange(n_vars))),
 )
 
 # Create AnnData object
 adata = ad.AnnData(X=X, obs=obs, var=var)
 
 # Add obsm (dimensional reductions)
-adata.obsm['X_pca'] = np.random.randn(n_obs, 50).astype(np.float32)
-adata.obsm['X_umap'] = np.random.randn(n_obs, 2).astype(np.float32)
-adata.obsm['X_tsne'] = np.random.randn(n_obs, 2).astype(np.float32)
+adata.obsm['X_pca'] = rs.randn(n_obs, 50).astype(np.float32)
+adata.obsm['X_umap'] = rs.randn(n_obs, 2).astype(np.float32)
+adata.obsm['X_tsne'] = rs.randn(n_obs, 2).astype(np.float32)
 
 # Add varm (gene embeddings)
-adata.varm['PCs'] = np.random.randn(n_vars, 50).astype(np.float32)
-adata.varm['gene_loadings'] = np.random.randn(n_vars, 10).astype(np.float32)
+adata.varm['PCs'] = rs.randn(n_vars, 50).astype(np.float32)
+adata.varm['gene_loadings'] = rs.randn(n_vars, 10).astype(np.float32)
 
-# Add layers
-adata.layers['raw_counts'] = sparse.random(n_obs, n_vars, density=density, format='csr', dtype=np.float32)
-adata.layers['normalized'] = X.copy()
-adata.layers['normalized'].data = np.log1p(adata.layers['normalized'].data)
+# Add layers - normalized reuses X's sparsity pattern, raw_counts keeps its own draw
+adata.layers['raw_counts'] = fast_random_csr(n_obs, n_vars, density, np.float32)
+normalized = X.copy()
+np.log1p(normalized.data, out=normalized.data)
+adata.layers['normalized'] = normalized
 
 # Add obsp (cell-cell matrices) - sparse
-adata.obsp['distances'] = sparse.random(n_obs, n_obs, density=0.1, format='csr', dtype=np.float32)
-adata.obsp['connectivities'] = sparse.random(n_obs, n_obs, density=0.1, format='csr', dtype=np.float32)
+adata.obsp['distances'] = fast_random_csr(n_obs, n_obs, 0.1, np.float32)
+adata.obsp['connectivities'] = fast_random_csr(n_obs, n_obs, 0.1, np.float32)
 
 # Add varp (gene-gene matrices) - sparse
-adata.varp['correlations'] = sparse.random(n_vars, n_vars, density=0.1, format='csr', dtype=np.float32)
+adata.varp['correlations'] = fast_random_csr(n_vars, n_vars, 0.1, np.float32)
 
 # Add uns (unstructured)
 adata.uns['method'] = 'test_comprehensive'
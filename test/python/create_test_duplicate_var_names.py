@@ -21,12 +21,12 @@ obs = pd.DataFrame(
     {
         "cell_type": ["T_cell", "B_cell", "T_cell", "NK_cell"],
     },
-    index=[f"cell_{i}" for i in range(n_obs)],
+    index=pd.Index(np.char.mod("cell_%d", np.arange(n_obs))),
 )
 
 var = pd.DataFrame(
     {
-        "gene_id": [f"ENSG{i:08d}" for i in range(n_var)],
+        "gene_id": np.char.mod("ENSG%08d", np.arange(n_var)),
     },
     index=pd.Index(gene_names, name="feature_name"),
 )
@@ -3,17 +3,20 @@
 
 import h5py
 import numpy as np
+from fixture_utils import LIBVER, s_ids
 
 output_path = "test/data/test_int32_codes.h5ad"
 
 n_obs = 10
 n_vars = 5
 
-with h5py.File(output_path, "w") as f:
+rng = np.random.default_rng(42)
+
+with h5py.File(output_path, "w", libver=LIBVER) as f:
     # Create minimal AnnData structure
 
-    # X matrix (dense)
-    X = f.create_dataset("X", data=np.random.rand(n_obs, n_vars).astype(np.float32))
+    # X matrix (dense, contiguous)
+    X = f.create_dataset("X", data=rng.random((n_obs, n_vars), dtype=np.float32), chunks=None)
     X.attrs["encoding-type"] = "array"
     X.attrs["encoding-version"] = "0.2.0"
 
@@ -25,8 +28,7 @@ with h5py.File(output_path, "w") as f:
     obs.attrs["column-order"] = []
 
     # obs _index
-    obs_index = [f"cell_{i}" for i in range(n_obs)]
-    obs.create_dataset("_index", data=np.array(obs_index, dtype="S"))
+    obs.create_dataset("_index", data=s_ids(b"cell_", n_obs))
 
     # var group
     var = f.create_group("var")
@@ -36,8 +38,7 @@ with h5py.File(output_path, "w") as f:
     var.attrs["column-order"] = np.array(["gene_name", "gene_length"], dtype="S")
 
     # var _index
-    var_index = [f"var_{i}" for i in range(n_vars)]
-    var.create_dataset("_index", data=np.array(var_index, dtype="S"))
+    var.create_dataset("_index", data=s_ids(b"var_", n_vars))
 
     # gene_name as categorical with int32 codes (forced)
     gene_name_grp = var.create_group("gene_name")
@@ -45,8 +46,7 @@ with h5py.File(output_path, "w") as f:
     gene_name_grp.attrs["encoding-version"] = "0.2.0"
     gene_name_grp.attrs["ordered"] = False
 
-    gene_names = [f"Gene_{i}" for i in range(n_vars)]
-    gene_name_grp.create_dataset("categories", data=np.array(gene_names, dtype="S"))
+    gene_name_grp.create_dataset("categories", data=s_ids(b"Gene_", n_vars))
     # Force int32 codes even though we only have 5 categories
     gene_name_grp.create_dataset("codes", data=np.arange(n_vars, dtype=np.int32))
 
@@ -56,7 +56,7 @@ with h5py.File(output_path, "w") as f:
     gene_length_grp.attrs["encoding-version"] = "0.2.0"
     gene_length_grp.attrs["ordered"] = False
 
-    gene_lengths = np.array([1000 + i * 100 for i in range(n_vars)], dtype=np.int64)
+    gene_lengths = 1000 + np.arange(n_vars, dtype=np.int64) * 100
     gene_length_grp.create_dataset("categories", data=gene_lengths)
     # Force int32 codes
     gene_length_grp.create_dataset("codes", data=np.arange(n_vars, dtype=np.int32))
@@ -68,16 +68,3 @@ with h5py.File(output_path, "w") as f:
         grp.attrs["encoding-version"] = "0.1.0"
 
 print(f"Created {output_path}")
-
-# Verify
-with h5py.File(output_path, "r") as f:
-    print("\nVar structure:")
-    for key in f["var"].keys():
-        item = f["var"][key]
-        if isinstance(item, h5py.Group):
-            print(f"  {key}: Group (categorical)")
-            for subkey in item.keys():
-                subitem = item[subkey]
-                print(f"    {subkey}: {subitem.dtype} shape={subitem.shape}")
-        else:
-            print(f"  {key}: Dataset {item.dtype} shape={item.shape}")
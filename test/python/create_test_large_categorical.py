@@ -1,59 +1,61 @@
 #!/usr/bin/env python3
 """Create test h5ad file with large categorical columns (>127 categories) and integer categories."""
 
-import anndata as ad
+import h5py
 import numpy as np
 import pandas as pd
+from anndata.io import write_elem
 
 # Create a dataset with enough variables to require int16 codes
 n_obs = 50
 n_vars = 200  # More than 127 to require int16 codes
 
+rng = np.random.default_rng(42)
+
 # Random expression data
-X = np.random.rand(n_obs, n_vars).astype(np.float32)
+X = rng.random((n_obs, n_vars), dtype=np.float32)
 
-# Observation metadata
-obs = pd.DataFrame(
-    {
-        "cell_type": pd.Categorical(["TypeA", "TypeB"] * (n_obs // 2)),
-    },
-    index=[f"cell_{i}" for i in range(n_obs)],
-)
+# Observation index and metadata
+obs_index = np.char.mod("cell_%d", np.arange(n_obs))
+cell_type = pd.Categorical.from_codes(np.arange(n_obs, dtype=np.int8) % 2, categories=["TypeA", "TypeB"])
 
 # Variable metadata with:
 # 1. feature_name as categorical with 200 unique values (requires int16 codes)
 # 2. feature_length as categorical with integer values
-gene_names = [f"Gene_{i}" for i in range(n_vars)]
-gene_lengths = [1000 + i * 10 for i in range(n_vars)]  # Unique integer lengths
-
-var = pd.DataFrame(
-    {
-        "feature_name": pd.Categorical(gene_names),  # 200 categories -> int16 codes
-        "feature_length": pd.Categorical(gene_lengths),  # Integer categories
-        "gene_id": [f"ENSG{i:011d}" for i in range(n_vars)],
-    },
-    index=[f"var_{i}" for i in range(n_vars)],
-)
+var_index = np.char.mod("var_%d", np.arange(n_vars))
+gene_names = np.char.mod("Gene_%d", np.arange(n_vars))
+gene_lengths = 1000 + np.arange(n_vars) * 10  # Unique integer lengths
+# Lexicographically sorted categories, as pd.Categorical infers them, so the codes are not the identity
+gene_name_categories = np.sort(gene_names)
+var_columns = {
+    "feature_name": pd.Categorical.from_codes(
+        np.searchsorted(gene_name_categories, gene_names).astype(np.int16), categories=gene_name_categories
+    ),
+    "feature_length": pd.Categorical.from_codes(np.arange(n_vars, dtype=np.int16), categories=gene_lengths),
+    "gene_id": np.char.mod("ENSG%011d", np.arange(n_vars)),
+}
+
+
+def write_dataframe(f, key, index, columns):
+    """Write a dataframe group column by column, without building a pandas DataFrame."""
+    grp = f.create_group(key)
+    grp.attrs["encoding-type"] = "dataframe"
+    grp.attrs["encoding-version"] = "0.2.0"
+    grp.attrs["_index"] = "_index"
+    grp.attrs["column-order"] = np.array(list(columns), dtype=object)
+    write_elem(grp, "_index", index)
+    for name, values in columns.items():
+        write_elem(grp, name, values)
 
-# Create AnnData object
-adata = ad.AnnData(X=X, obs=obs, var=var)
 
 # Save to h5ad
 output_path = "test/data/test_large_categorical.h5ad"
-adata.write_h5ad(output_path)
+with h5py.File(output_path, "w") as f:
+    f.attrs["encoding-type"] = "anndata"
+    f.attrs["encoding-version"] = "0.1.0"
+    write_elem(f, "X", X)
+    write_dataframe(f, "obs", obs_index, {"cell_type": cell_type})
+    write_dataframe(f, "var", var_index, var_columns)
+    for grp_name in ["obsm", "varm", "obsp", "varp", "layers", "uns"]:
+        write_elem(f, grp_name, {})
 print(f"Created {output_path}")
-
-# Verify the structure
-import h5py
-
-with h5py.File(output_path, "r") as f:
-    print("\nVar structure:")
-    for key in f["var"].keys():
-        item = f["var"][key]
-        if isinstance(item, h5py.Group):
-            print(f"  {key}: Group (categorical)")
-            for subkey in item.keys():
-                subitem = item[subkey]
-                print(f"    {subkey}: {subitem.dtype} shape={subitem.shape}")
-        else:
-            print(f"  {key}: Dataset {item.dtype} shape={item.shape}")
@@ -19,24 +19,25 @@ obs = pd.DataFrame(
         "cell_type": ["T_cell", "B_cell", "T_cell", "Monocyte", "NK_cell"],
         "batch": ["batch1", "batch1", "batch2", "batch2", "batch1"],
     },
-    index=[f"cell_{i}" for i in range(n_obs)],
+    index=pd.Index(np.char.mod("cell_%d", np.arange(n_obs))),
 )
 
 # Create variable metadata with gene names as index
 var = pd.DataFrame(
     {
-        "gene_id": [f"ENSG{i:08d}" for i in range(n_var)],
+        "gene_id": np.char.mod("ENSG%08d", np.arange(n_var)),
         "highly_variable": [True, False, True, False, True, False, True, False, True, False],
     },
     index=gene_names,
 )
 
 # Create dense X matrix
-np.random.seed(42)
-X = np.random.rand(n_obs, n_var).astype(np.float32)
+# Legacy seeded stream: test/sql/anndata_layers.test asserts the raw_counts it produces
+rs = np.random.RandomState(42)
+X = rs.rand(n_obs, n_var).astype(np.float32)
 
 # Create a layer with integer counts
-raw_counts = np.random.randint(0, 100, size=(n_obs, n_var)).astype(np.int32)
+raw_counts = rs.randint(0, 100, size=(n_obs, n_var)).astype(np.int32)
 
 # Create AnnData object
 adata = ad.AnnData(X=X, obs=obs, var=var, layers={"raw_counts": raw_counts})
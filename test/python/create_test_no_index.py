@@ -3,30 +3,34 @@
 
 import h5py
 import numpy as np
-from scipy import sparse
+from fixture_utils import LIBVER, s_ids, write_sparse_arrays
 
 output_path = "test/data/test_no_index.h5ad"
 
 n_obs = 50
 n_vars = 100
 
-# Create sparse CSR matrix
+rng = np.random.default_rng(42)
+
+# Create sparse CSR arrays directly: sorted distinct flat positions give
+# row-major (row, col) pairs, and per-row counts give indptr
 density = 0.1
 nnz = int(n_obs * n_vars * density)
-rows = np.random.randint(0, n_obs, nnz)
-cols = np.random.randint(0, n_vars, nnz)
-data = np.random.rand(nnz).astype(np.float32)
-X = sparse.csr_matrix((data, (rows, cols)), shape=(n_obs, n_vars))
+flat = np.sort(rng.choice(n_obs * n_vars, nnz, replace=False))
+rows, cols = np.divmod(flat, n_vars)
+indptr = np.zeros(n_obs + 1, dtype=np.int32)
+np.cumsum(np.bincount(rows, minlength=n_obs), out=indptr[1:])
+indices = cols.astype(np.int32)
+data = rng.random(nnz, dtype=np.float32)
 
-with h5py.File(output_path, "w") as f:
+with h5py.File(output_path, "w", libver=LIBVER) as f:
     # X as sparse CSR - with shape attribute
     x_grp = f.create_group("X")
     x_grp.attrs["encoding-type"] = "csr_matrix"
     x_grp.attrs["encoding-version"] = "0.1.0"
     x_grp.attrs["shape"] = np.array([n_obs, n_vars], dtype=np.int64)
-    x_grp.create_dataset("data", data=X.data)
-    x_grp.create_dataset("indices", data=X.indices.astype(np.int32))
-    x_grp.create_dataset("indptr", data=X.indptr.astype(np.int32))
+    # Tiny fixture: keep the CSR arrays contiguous rather than chunked
+    write_sparse_arrays(x_grp, data, indices, indptr)
 
     # obs group - WITHOUT _index dataset
     obs = f.create_group("obs")
@@ -42,7 +46,7 @@ with h5py.File(output_path, "w") as f:
     cell_type_grp.attrs["ordered"] = False
     cell_types = ["TypeA", "TypeB", "TypeC"]
     cell_type_grp.create_dataset("categories", data=np.array(cell_types, dtype="S"))
-    cell_type_grp.create_dataset("codes", data=np.array([i % 3 for i in range(n_obs)], dtype=np.int8))
+    cell_type_grp.create_dataset("codes", data=(np.arange(n_obs) % 3).astype(np.int8))
 
     # var group - WITHOUT _index dataset
     var = f.create_group("var")
@@ -56,8 +60,7 @@ with h5py.File(output_path, "w") as f:
     gene_name_grp.attrs["encoding-type"] = "categorical"
     gene_name_grp.attrs["encoding-version"] = "0.2.0"
     gene_name_grp.attrs["ordered"] = False
-    gene_names = [f"Gene_{i}" for i in range(n_vars)]
-    gene_name_grp.create_dataset("categories", data=np.array(gene_names, dtype="S"))
+    gene_name_grp.create_dataset("categories", data=s_ids(b"Gene_", n_vars))
     gene_name_grp.create_dataset("codes", data=np.arange(n_vars, dtype=np.int8))
 
     # Empty groups for other AnnData components
@@ -67,12 +70,3 @@ with h5py.File(output_path, "w") as f:
         grp.attrs["encoding-version"] = "0.1.0"
 
 print(f"Created {output_path}")
-
-# Verify structure
-with h5py.File(output_path, "r") as f:
-    print("\nStructure:")
-    print(f"  X shape attr: {f['X'].attrs['shape'][:]}")
-    print(f"  obs keys: {list(f['obs'].keys())}")
-    print(f"  var keys: {list(f['var'].keys())}")
-    print(f"  '_index' in obs: {'_index' in f['obs']}")
-    print(f"  '_index' in var: {'_index' in f['var']}")
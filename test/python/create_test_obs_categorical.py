@@ -3,17 +3,50 @@
 
 import h5py
 import numpy as np
+from fixture_utils import s_ids
 
 output_path = "test/data/test_obs_categorical.h5ad"
 
 n_obs = 200  # Enough to require int16 codes for some categoricals
 n_vars = 5
 
+rng = np.random.default_rng(42)
+
+
+def _codes_dtype(n_categories):
+    """Smallest signed integer dtype for categorical codes (anndata reserves -1 for missing)."""
+    if n_categories <= np.iinfo(np.int8).max:
+        return np.int8
+    if n_categories <= np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
+
+
+def _ds(grp, name, data, compression="lzf", compression_opts=None, threshold=1 << 16):
+    """Write a 1-D member, contiguous if small, else chunked, byte-shuffled and compressed.
+
+    Below ``threshold`` bytes a chunk index costs more than compression saves, so the data
+    is stored contiguously. Larger numeric arrays get ~1 MiB chunks; fixed-length strings
+    are capped at 4096 entries per chunk.
+    """
+    if data.nbytes < threshold:
+        return grp.create_dataset(name, data=data)
+    max_len = 4096 if data.dtype.kind == "S" else (1 << 20) // data.dtype.itemsize
+    return grp.create_dataset(
+        name,
+        data=data,
+        chunks=(min(len(data), max_len),),
+        compression=compression,
+        compression_opts=compression_opts,
+        shuffle=True,
+    )
+
+
 with h5py.File(output_path, "w") as f:
     # Create minimal AnnData structure
 
     # X matrix (dense)
-    X = f.create_dataset("X", data=np.random.rand(n_obs, n_vars).astype(np.float32))
+    X = f.create_dataset("X", data=rng.random((n_obs, n_vars), dtype=np.float32))
     X.attrs["encoding-type"] = "array"
     X.attrs["encoding-version"] = "0.2.0"
 
@@ -24,9 +57,9 @@ with h5py.File(output_path, "w") as f:
     obs.attrs["_index"] = "_index"
     obs.attrs["column-order"] = np.array(["cell_type", "cell_size", "cluster_id"], dtype="S")
 
-    # obs _index
-    obs_index = [f"cell_{i}" for i in range(n_obs)]
-    obs.create_dataset("_index", data=np.array(obs_index, dtype="S"))
+    # obs _index: exact-width S strings; once large enough to chunk, gzip over shuffled bytes
+    # packs the shared "cell_" prefix well
+    _ds(obs, "_index", s_ids(b"cell_", n_obs), compression="gzip", compression_opts=4)
 
     # cell_type as categorical with int16 codes (200 unique values)
     cell_type_grp = obs.create_group("cell_type")
@@ -34,9 +67,9 @@ with h5py.File(output_path, "w") as f:
     cell_type_grp.attrs["encoding-version"] = "0.2.0"
     cell_type_grp.attrs["ordered"] = False
 
-    cell_types = [f"CellType_{i}" for i in range(n_obs)]
-    cell_type_grp.create_dataset("categories", data=np.array(cell_types, dtype="S"))
-    cell_type_grp.create_dataset("codes", data=np.arange(n_obs, dtype=np.int16))
+    cell_types = s_ids(b"CellType_", n_obs)
+    _ds(cell_type_grp, "categories", cell_types)
+    _ds(cell_type_grp, "codes", np.arange(n_obs, dtype=_codes_dtype(len(cell_types))))
 
     # cell_size as categorical with int32 codes and int64 categories
     cell_size_grp = obs.create_group("cell_size")
@@ -44,9 +77,10 @@ with h5py.File(output_path, "w") as f:
     cell_size_grp.attrs["encoding-version"] = "0.2.0"
     cell_size_grp.attrs["ordered"] = False
 
-    cell_sizes = np.array([100 + i * 5 for i in range(n_obs)], dtype=np.int64)
-    cell_size_grp.create_dataset("categories", data=cell_sizes)
-    cell_size_grp.create_dataset("codes", data=np.arange(n_obs, dtype=np.int32))
+    cell_sizes = 100 + np.arange(n_obs, dtype=np.int64) * 5
+    _ds(cell_size_grp, "categories", cell_sizes)
+    # Deliberately wider than needed, to cover the int32 codes path
+    _ds(cell_size_grp, "codes", np.arange(n_obs, dtype=np.int32))
 
     # cluster_id as categorical with int8 codes (only 10 clusters, repeating)
     cluster_grp = obs.create_group("cluster_id")
@@ -54,9 +88,9 @@ with h5py.File(output_path, "w") as f:
     cluster_grp.attrs["encoding-version"] = "0.2.0"
     cluster_grp.attrs["ordered"] = False
 
-    clusters = [f"Cluster_{i}" for i in range(10)]
-    cluster_grp.create_dataset("categories", data=np.array(clusters, dtype="S"))
-    cluster_grp.create_dataset("codes", data=np.array([i % 10 for i in range(n_obs)], dtype=np.int8))
+    clusters = s_ids(b"Cluster_", 10)
+    _ds(cluster_grp, "categories", clusters)
+    _ds(cluster_grp, "codes", (np.arange(n_obs) % 10).astype(_codes_dtype(len(clusters))))
 
     # var group
     var = f.create_group("var")
@@ -65,8 +99,7 @@ with h5py.File(output_path, "w") as f:
     var.attrs["_index"] = "_index"
     var.attrs["column-order"] = []
 
-    var_index = [f"gene_{i}" for i in range(n_vars)]
-    var.create_dataset("_index", data=np.array(var_index, dtype="S"))
+    _ds(var, "_index", s_ids(b"gene_", n_vars), compression="gzip", compression_opts=4)
 
     # Empty groups for other AnnData components
     for grp_name in ["obsm", "varm", "obsp", "varp", "layers", "uns"]:
@@ -75,16 +108,3 @@ with h5py.File(output_path, "w") as f:
         grp.attrs["encoding-version"] = "0.1.0"
 
 print(f"Created {output_path}")
-
-# Verify
-with h5py.File(output_path, "r") as f:
-    print("\nObs structure:")
-    for key in f["obs"].keys():
-        item = f["obs"][key]
-        if isinstance(item, h5py.Group):
-            print(f"  {key}: Group (categorical)")
-            for subkey in item.keys():
-                subitem = item[subkey]
-                print(f"    {subkey}: {subitem.dtype} shape={subitem.shape}")
-        else:
-            print(f"  {key}: Dataset {item.dtype} shape={item.shape}")
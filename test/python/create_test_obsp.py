@@ -3,60 +3,68 @@
 
 import anndata
 import numpy as np
+import pandas as pd
 from scipy import sparse
 
 # Create a small AnnData object
 n_obs = 100
 n_var = 50
 
+rng = np.random.default_rng(42)
+
 # Create basic data
-X = np.random.rand(n_obs, n_var)
+X = rng.random((n_obs, n_var))
 adata = anndata.AnnData(X=X)
-adata.obs_names = [f'cell_{i}' for i in range(n_obs)]
-adata.var_names = [f'gene_{i}' for i in range(n_var)]
+adata.obs_names = np.char.mod('cell_%d', np.arange(n_obs))
+adata.var_names = np.char.mod('gene_%d', np.arange(n_var))
 
-# Add some obs and var metadata
-adata.obs['cell_type'] = np.random.choice(['A', 'B', 'C'], n_obs)
-adata.var['gene_type'] = np.random.choice(['protein', 'lncRNA', 'miRNA'], n_var)
+# Add some obs and var metadata (categoricals built straight from random codes,
+# with categories in the sorted order factorizing the strings would give)
+adata.obs['cell_type'] = pd.Categorical.from_codes(rng.integers(0, 3, n_obs, dtype=np.int8), categories=['A', 'B', 'C'])
+adata.var['gene_type'] = pd.Categorical.from_codes(
+    rng.integers(0, 3, n_var, dtype=np.int8), categories=['lncRNA', 'miRNA', 'protein']
+)
 
 # Create sparse obsp matrices (cell-cell relationships)
 print("Creating obsp matrices...")
 
+# Legacy seeded stream: test/sql/obsp_varp.test asserts the nnz and values it produces
+rs = np.random.RandomState(42)
+
+
+def random_coalesced_csr(n, n_entries, scale=1.0, shift=0.0):
+    """Build an n x n CSR matrix from n_entries random (row, col, value) triplets.
+
+    Pairs may repeat and csr_matrix sums the duplicates, so nnz ends up slightly
+    below n_entries.
+    """
+    row_idx = rs.randint(0, n, n_entries)
+    col_idx = rs.randint(0, n, n_entries)
+    values = rs.rand(n_entries)
+    values *= scale
+    values += shift
+    return sparse.csr_matrix((values, (row_idx, col_idx)), shape=(n, n))
+
+
 # 1. Connectivities matrix (sparse, symmetric)
-np.random.seed(42)
 n_connections = 500
-row_idx = np.random.randint(0, n_obs, n_connections)
-col_idx = np.random.randint(0, n_obs, n_connections)
-values = np.random.rand(n_connections)
-connectivities = sparse.csr_matrix((values, (row_idx, col_idx)), shape=(n_obs, n_obs))
-adata.obsp['connectivities'] = connectivities
+adata.obsp['connectivities'] = random_coalesced_csr(n_obs, n_connections)
 
 # 2. Distances matrix (sparse, also symmetric)
 n_distances = 300
-row_idx = np.random.randint(0, n_obs, n_distances)
-col_idx = np.random.randint(0, n_obs, n_distances)
-values = np.random.rand(n_distances) * 10  # Distances in range [0, 10]
-distances = sparse.csr_matrix((values, (row_idx, col_idx)), shape=(n_obs, n_obs))
-adata.obsp['distances'] = distances
+adata.obsp['distances'] = random_coalesced_csr(n_obs, n_distances, scale=10)  # Distances in range [0, 10]
 
 # Create sparse varp matrices (gene-gene relationships)
 print("Creating varp matrices...")
 
 # 1. Gene correlation matrix
 n_correlations = 200
-row_idx = np.random.randint(0, n_var, n_correlations)
-col_idx = np.random.randint(0, n_var, n_correlations)
-values = np.random.rand(n_correlations) * 2 - 1  # Correlations in range [-1, 1]
-correlations = sparse.csr_matrix((values, (row_idx, col_idx)), shape=(n_var, n_var))
-adata.varp['correlations'] = correlations
+# Correlations in range [-1, 1]
+adata.varp['correlations'] = random_coalesced_csr(n_var, n_correlations, scale=2, shift=-1)
 
 # 2. Gene coexpression matrix
 n_coexp = 150
-row_idx = np.random.randint(0, n_var, n_coexp)
-col_idx = np.random.randint(0, n_var, n_coexp)
-values = np.random.rand(n_coexp)
-coexpression = sparse.csr_matrix((values, (row_idx, col_idx)), shape=(n_var, n_var))
-adata.varp['coexpression'] = coexpression
+adata.varp['coexpression'] = random_coalesced_csr(n_var, n_coexp)
 
 # Save the file
 output_file = 'test/data/test_obsp_varp.h5ad'
@@ -1,27 +1,37 @@
 import anndata as ad
+import h5py
 import pandas as pd
 import numpy as np
+import os
+
+from anndata.io import write_elem
+from fixture_utils import LIBVER
 
 # Create a small test dataset
 n_obs = 100
 n_vars = 50
 
-X = np.random.randn(n_obs, n_vars)
+rng = np.random.default_rng(42)
+
+X = rng.standard_normal((n_obs, n_vars))
 
+# Categories are listed sorted, the order factorizing the strings would give
 obs = pd.DataFrame(
     {
-        'cell_type': np.random.choice(['T cell', 'B cell', 'NK cell'], n_obs),
-        'batch': np.random.choice(['batch1', 'batch2'], n_obs),
-        'n_genes': np.random.randint(100, 500, n_obs),
+        'cell_type': pd.Categorical.from_codes(
+            rng.integers(0, 3, n_obs, dtype=np.int8), categories=['B cell', 'NK cell', 'T cell']
+        ),
+        'batch': pd.Categorical.from_codes(rng.integers(0, 2, n_obs, dtype=np.int8), categories=['batch1', 'batch2']),
+        'n_genes': rng.integers(100, 500, n_obs),
     }
 )
 
 var = pd.DataFrame(
     {
-        'gene_name': [f'Gene_{i}' for i in range(n_vars)],
-        'highly_variable': np.random.choice([True, False], n_vars),
-        'mean': np.random.rand(n_vars),
-        'std': np.random.rand(n_vars),
+        'gene_name': np.char.mod('Gene_%d', np.arange(n_vars)),
+        'highly_variable': rng.choice([True, False], n_vars),
+        'mean': rng.random(n_vars),
+        'std': rng.random(n_vars),
     }
 )
 
@@ -38,13 +48,13 @@ adata.uns['normalization_method'] = 'log1p'
 
 # Add arrays
 adata.uns['quality_metrics'] = np.array([0.95, 0.87, 0.92, 0.88, 0.91])
-adata.uns['batch_effects'] = np.random.rand(10)
+adata.uns['batch_effects'] = rng.random(10)
 
 # Add nested dictionaries (common in scanpy)
 adata.uns['pca'] = {
     'params': {'n_comps': 50, 'use_highly_variable': True, 'random_state': 42},
-    'variance': np.random.rand(50),
-    'variance_ratio': np.random.rand(50),
+    'variance': rng.random(50),
+    'variance_ratio': rng.random(50),
 }
 
 adata.uns['umap'] = {'params': {'n_neighbors': 15, 'min_dist': 0.1, 'spread': 1.0, 'random_state': 42}}
@@ -57,18 +67,24 @@ adata.uns['batch_colors'] = ['#d62728', '#9467bd']
 adata.uns['rank_genes_groups'] = pd.DataFrame(
     {
         'names': ['CD3D', 'CD3E', 'CD8A', 'CD4', 'CD19'],
-        'scores': np.random.rand(5),
-        'pvals': np.random.rand(5),
-        'pvals_adj': np.random.rand(5),
-        'logfoldchanges': np.random.randn(5),
+        'scores': rng.random(5),
+        'pvals': rng.random(5),
+        'pvals_adj': rng.random(5),
+        'logfoldchanges': rng.standard_normal(5),
     }
 )
 
 # Add clustering parameters
 adata.uns['leiden'] = {'params': {'resolution': 1.0, 'n_iterations': -1}}
 
-# Save the file
-adata.write('../data/test_uns.h5ad')
+# Save the file in a single h5py session. The uns scalars stay 0-d datasets (the
+# reader and the on-disk spec expect them there), but newer-format link storage
+# keeps the many small uns groups cheap to create.
+output_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'test_uns.h5ad')
+adata.strings_to_categoricals()  # as write_h5ad does
+with h5py.File(output_path, 'w', libver=LIBVER) as f:
+    write_elem(f, '/', adata)
+    del f['raw']  # null placeholder; write_h5ad leaves raw out when there is none
 print(f"Created test_uns.h5ad with {len(adata.uns)} uns keys:")
 for k, v in adata.uns.items():
     if isinstance(v, dict):
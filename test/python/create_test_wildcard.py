@@ -16,13 +16,18 @@ Obs column union: shared + unique1 + unique2 + unique3
 """
 
 import anndata as ad
+import h5py
 import numpy as np
 import pandas as pd
 from scipy import sparse
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+from anndata.io import write_elem
+from fixture_utils import LIBVER
 
 # Set seed for reproducibility
-np.random.seed(42)
+SEED = 42
 
 # Common dimensions
 n_obs = 20  # Small for testing
@@ -30,33 +35,38 @@ n_common_genes = 2  # C, D are common to all
 n_unique_genes = 2  # Each file has 2 unique genes
 
 
-def create_sample(sample_num: int, gene_names: list, obs_unique_col: str, output_dir: str):
-    """Create a single test sample h5ad file."""
+def create_sample(rs: np.random.RandomState, sample_num: int, gene_names: list, obs_unique_col: str):
+    """Draw a single test sample's AnnData from the shared stream ``rs``."""
     n_genes = len(gene_names)
 
     # Create sparse X matrix
-    X = sparse.random(n_obs, n_genes, density=0.5, format='csr', dtype=np.float32)
-    X.data = np.abs(X.data) * 10
+    X = sparse.random(n_obs, n_genes, density=0.5, format='csr', dtype=np.float32, random_state=rs)
+    np.abs(X.data, out=X.data)
+    X.data *= 10
 
     # Create obs DataFrame with shared and unique columns
     cell_types = ['T cell', 'B cell', 'Monocyte']
+    # Position of each cell type in sorted order, the order factorizing the strings would give
+    cell_type_codes = np.argsort(np.argsort(cell_types)).astype(np.int8)
     obs = pd.DataFrame(
         {
             # Shared columns (present in all files)
-            'cell_type': pd.Categorical(np.random.choice(cell_types, n_obs)),
-            'n_counts': np.random.randint(1000, 5000, n_obs),
+            'cell_type': pd.Categorical.from_codes(
+                cell_type_codes[rs.randint(0, len(cell_types), n_obs)], categories=sorted(cell_types)
+            ),
+            'n_counts': rs.randint(1000, 5000, n_obs),
             'sample_id': f'sample{sample_num}',
             # Unique column for this file
-            obs_unique_col: np.random.uniform(0, 1, n_obs),
+            obs_unique_col: rs.uniform(0, 1, n_obs),
         },
-        index=[f's{sample_num}_cell_{i}' for i in range(n_obs)],
+        index=pd.Index(np.char.mod(f's{sample_num}_cell_%d', np.arange(n_obs))),
     )
 
     # Create var DataFrame
     var = pd.DataFrame(
         {
             'gene_name': gene_names,
-            'highly_variable': np.random.choice([True, False], n_genes),
+            'highly_variable': rs.choice([True, False], n_genes),
         },
         index=gene_names,
     )
@@ -66,34 +76,50 @@ def create_sample(sample_num: int, gene_names: list, obs_unique_col: str, output
 
     # Add obsm (dimensional reductions) - different dimensions per file
     n_pca_dims = 10 + sample_num  # 11, 12, 13 dimensions
-    adata.obsm['X_pca'] = np.random.randn(n_obs, n_pca_dims).astype(np.float32)
-    adata.obsm['X_umap'] = np.random.randn(n_obs, 2).astype(np.float32)
+    adata.obsm['X_pca'] = rs.randn(n_obs, n_pca_dims).astype(np.float32)
+    adata.obsm['X_umap'] = rs.randn(n_obs, 2).astype(np.float32)
 
     # Add varm
-    adata.varm['loadings'] = np.random.randn(n_genes, 5).astype(np.float32)
+    adata.varm['loadings'] = rs.randn(n_genes, 5).astype(np.float32)
 
     # Add layers
-    adata.layers['raw'] = sparse.random(n_obs, n_genes, density=0.5, format='csr', dtype=np.float32)
+    adata.layers['raw'] = sparse.random(n_obs, n_genes, density=0.5, format='csr', dtype=np.float32, random_state=rs)
     adata.layers['normalized'] = X.copy()
 
     # Add obsp (cell-cell matrices)
-    adata.obsp['distances'] = sparse.random(n_obs, n_obs, density=0.2, format='csr', dtype=np.float32)
+    adata.obsp['distances'] = sparse.random(n_obs, n_obs, density=0.2, format='csr', dtype=np.float32, random_state=rs)
 
     # Add varp (gene-gene matrices)
-    adata.varp['correlations'] = sparse.random(n_genes, n_genes, density=0.3, format='csr', dtype=np.float32)
-
-    # Save
-    output_path = os.path.join(output_dir, f'wildcard_sample{sample_num}.h5ad')
-    adata.write_h5ad(output_path)
-    print(f"Created {output_path}")
-    print(f"  n_obs: {adata.n_obs}, n_vars: {adata.n_vars}")
-    print(f"  genes: {gene_names}")
-    print(f"  obs columns: {list(adata.obs.columns)}")
-    print(f"  obsm X_pca dims: {adata.obsm['X_pca'].shape[1]}")
+    adata.varp['correlations'] = sparse.random(
+        n_genes, n_genes, density=0.3, format='csr', dtype=np.float32, random_state=rs
+    )
 
     return adata
 
 
+def write_sample(adata: ad.AnnData, output_path: str):
+    """Write one sample's h5ad file and print its summary."""
+    adata.strings_to_categoricals()  # as write_h5ad does
+    with h5py.File(output_path, 'w', libver=LIBVER) as f:
+        write_elem(f, '/', adata)
+        del f['raw']  # null placeholder; write_h5ad leaves raw out when there is none
+    # One print per sample, so summaries from parallel workers don't interleave
+    print(
+        f"Created {output_path}\n"
+        f"  n_obs: {adata.n_obs}, n_vars: {adata.n_vars}\n"
+        f"  genes: {list(adata.var_names)}\n"
+        f"  obs columns: {list(adata.obs.columns)}\n"
+        f"  obsm X_pca dims: {adata.obsm['X_pca'].shape[1]}\n",
+        end="",
+        flush=True,
+    )
+
+
+def _worker(args):
+    """Process-pool entry point: write one sample from an (adata, output_path) tuple."""
+    write_sample(*args)
+
+
 def main():
     output_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
     os.makedirs(output_dir, exist_ok=True)
@@ -113,8 +139,17 @@ def main():
 
     unique_obs_cols = ['metric_alpha', 'metric_beta', 'metric_gamma']
 
-    for i, (genes, obs_col) in enumerate(zip(gene_sets, unique_obs_cols), start=1):
-        create_sample(i, genes, obs_col, output_dir)
+    # Legacy seeded stream, shared by the samples in order, so regenerating reproduces the checked-in files
+    rs = np.random.RandomState(SEED)
+    jobs = [
+        (create_sample(rs, i, genes, obs_col), os.path.join(output_dir, f'wildcard_sample{i}.h5ad'))
+        for i, (genes, obs_col) in enumerate(zip(gene_sets, unique_obs_cols), start=1)
+    ]
+
+    # Drawing is cheap; the files are independent, so write them in parallel, one process each
+    # (HDF5 writes don't parallelize across threads, but separate processes on separate files do)
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        list(executor.map(_worker, jobs))
 
     print("\n" + "=" * 60)
     print("Wildcard test files created!")
@@ -0,0 +1,42 @@
+"""Shared helpers for the test fixture generators in this directory."""
+
+import h5py
+import numpy as np
+
+# Library version bounds for h5py-built fixtures: the newer object header and B-tree
+# formats make many small group/dataset inserts cheaper, and the v110 lower bound
+# keeps the files readable by HDF5 1.10+.
+LIBVER = ("v110", "latest")
+
+# Shared dataset-creation property list for sparse member arrays: contiguous, unfiltered
+_CONTIGUOUS_DCPL = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+_CONTIGUOUS_DCPL.set_layout(h5py.h5d.CONTIGUOUS)
+
+
+def s_ids(prefix: bytes, n: int, width: int = 0, start: int = 0, dtype=None) -> np.ndarray:
+    """Build fixed-length byte IDs ``prefix + zero-padded number`` without Python strings.
+
+    ``width`` zero-pads the number (``s_ids(b"cell_", 3, 4)`` -> ``b"cell_0000"``...).
+    The result uses the narrowest ``S<n>`` dtype that fits unless ``dtype`` is given,
+    so it can be passed straight to ``create_dataset``.
+    """
+    numbers = np.arange(start, start + n).astype("S")
+    if width:
+        numbers = np.char.zfill(numbers, width)
+    ids = np.char.add(prefix, numbers)
+    if dtype is None:
+        dtype = f"S{len(prefix) + max(width, len(str(start + n - 1)))}"
+    return ids.astype(dtype)
+
+
+def write_sparse_arrays(grp: h5py.Group, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray) -> None:
+    """Write the data/indices/indptr members of a CSR/CSC group.
+
+    Uses the low-level API with one prebuilt contiguous property list, skipping the
+    per-call keyword handling of ``create_dataset``.
+    """
+    for name, arr in (("data", data), ("indices", indices), ("indptr", indptr)):
+        arr = np.ascontiguousarray(arr)
+        space = h5py.h5s.create_simple(arr.shape)
+        dset = h5py.h5d.create(grp.id, name.encode(), h5py.h5t.py_create(arr.dtype), space, dcpl=_CONTIGUOUS_DCPL)
+        dset.write(h5py.h5s.ALL, h5py.h5s.ALL, arr)
@@ -4,82 +4,123 @@ Simple HTTP server with Range request support for testing remote HDF5 access.
 """
 
 import http.server
-import socketserver
 import os
+import re
+import stat
 import sys
+import uuid
 import argparse
 
+# Read size for the non-sendfile fallback when streaming a byte range
+COPY_CHUNK_SIZE = 1 << 20
+
+HDF5_SUFFIXES = (".h5ad", ".hdf5", ".h5")
+
+# Range: bytes=<spec>[,<spec>...] where each spec is "start-end", "start-" or "-suffix"
+_RANGE_HEADER_RE = re.compile(r"bytes=\s*(\d*-\d*(?:\s*,\s*\d*-\d*)*)\s*")
+_RANGE_SPEC_RE = re.compile(r"(\d*)-(\d*)")
+
+
+def regular_file_size(path):
+    """Return the size of path if it is a regular file, else None, using a single stat call."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size if stat.S_ISREG(st.st_mode) else None
+
+
+def parse_range_header(range_header, file_size):
+    """Parse a Range header into a list of inclusive (start, end) byte ranges.
+
+    Ranges starting past the end of the file are dropped; end offsets are clamped to the
+    file size. Raises ValueError for a malformed header or when no range is satisfiable.
+    """
+    match = _RANGE_HEADER_RE.fullmatch(range_header)
+    if not match:
+        raise ValueError(f"unsupported Range header {range_header!r}")
+
+    ranges = []
+    for first, last in _RANGE_SPEC_RE.findall(match.group(1)):
+        if first:
+            start = int(first)
+            end = min(int(last), file_size - 1) if last else file_size - 1
+            if last and int(last) < start:
+                raise ValueError(f"range {first}-{last} ends before it starts")
+        elif last:
+            # Suffix range: the final N bytes of the file
+            start = max(file_size - int(last), 0)
+            end = file_size - 1
+        else:
+            raise ValueError("empty range spec")
+        if start < file_size and start <= end:
+            ranges.append((start, end))
+
+    if not ranges:
+        raise ValueError(f"no satisfiable range for a {file_size}-byte file")
+    return ranges
+
 
 class RangeHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """HTTP handler that supports Range requests (HTTP 206 Partial Content)."""
 
+    # HTTP/1.1 keeps connections alive between requests, so a client issuing many
+    # small Range GETs reuses one socket instead of reconnecting for each chunk
+    protocol_version = "HTTP/1.1"
+
+    # Content type per served path, shared by all handler instances
+    _content_types = {}
+
     def do_HEAD(self):
         """Handle HEAD requests - send headers without body."""
         path = self.translate_path(self.path)
-        if not os.path.isfile(path):
+        file_size = regular_file_size(path)
+        if file_size is None:
             self.send_error(404, "File not found")
             return
 
-        file_size = os.path.getsize(path)
-
         # Check for Range header (shouldn't normally be in HEAD, but handle it)
         range_header = self.headers.get("Range")
         if range_header:
             try:
-                range_spec = range_header.replace("bytes=", "")
-                parts = range_spec.split("-")
-                start = int(parts[0]) if parts[0] else 0
-                end = int(parts[1]) if parts[1] else file_size - 1
-                end = min(end, file_size - 1)
-
-                self.send_response(206)
-                self.send_header("Content-Range", f"bytes {start}-{end}/{file_size}")
-                self.send_header("Content-Length", end - start + 1)
-            except (ValueError, IndexError):
-                self.send_response(200)
-                self.send_header("Content-Length", file_size)
-        else:
-            self.send_response(200)
-            self.send_header("Content-Length", file_size)
-
+                ranges = parse_range_header(range_header, file_size)
+            except ValueError:
+                ranges = None
+            if ranges:
+                self.send_range_headers(ranges, file_size, self.guess_type(path))
+                return
+
+        self.send_response(200)
+        self.send_header("Content-Length", file_size)
         self.send_header("Accept-Ranges", "bytes")
         self.send_header("Content-Type", self.guess_type(path))
         self.end_headers()
 
     def send_head(self):
         path = self.translate_path(self.path)
-        if not os.path.isfile(path):
+        file_size = regular_file_size(path)
+        if file_size is None:
             self.send_error(404, "File not found")
             return None
 
-        file_size = os.path.getsize(path)
-
         # Check for Range header
         range_header = self.headers.get("Range")
         if range_header:
             try:
-                # Parse Range: bytes=start-end
-                range_spec = range_header.replace("bytes=", "")
-                parts = range_spec.split("-")
-                start = int(parts[0]) if parts[0] else 0
-                end = int(parts[1]) if parts[1] else file_size - 1
-
-                # Clamp to file size
-                end = min(end, file_size - 1)
-
-                self.send_response(206)  # Partial Content
-                self.send_header("Content-Range", f"bytes {start}-{end}/{file_size}")
-                self.send_header("Content-Length", end - start + 1)
-                self.send_header("Accept-Ranges", "bytes")
-                self.send_header("Content-Type", self.guess_type(path))
+                ranges = parse_range_header(range_header, file_size)
+            except ValueError as e:
+                # RFC 7233 4.4: tell the client the current length with "bytes */<size>"
+                body = f"Invalid Range: {e}\n".encode()
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{file_size}")
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", len(body))
                 self.end_headers()
-
-                f = open(path, "rb")
-                f.seek(start)
-                return (f, start, end - start + 1)
-            except (ValueError, IndexError) as e:
-                self.send_error(416, f"Invalid Range: {e}")
+                self.wfile.write(body)
                 return None
+
+            segments, trailer = self.send_range_headers(ranges, file_size, self.guess_type(path))
+            return (open(path, "rb"), segments, trailer)
         else:
             # No Range header - send full file
             self.send_response(200)
@@ -89,19 +130,98 @@ class RangeHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             self.end_headers()
             return open(path, "rb")
 
+    def send_range_headers(self, ranges, file_size, content_type):
+        """Send the 206 status and headers for ranges; return the body segments to stream.
+
+        A single range is sent as-is. Several ranges become a multipart/byteranges body,
+        where each segment carries its own part header. Returns (segments, trailer), with
+        segments a list of (part_header, start, length).
+        """
+        self.send_response(206)  # Partial Content
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            segments, trailer = [(b"", start, end - start + 1)], b""
+            self.send_header("Content-Range", f"bytes {start}-{end}/{file_size}")
+            self.send_header("Content-Length", end - start + 1)
+            self.send_header("Content-Type", content_type)
+        else:
+            boundary = uuid.uuid4().hex
+            segments = []
+            for start, end in ranges:
+                part_header = (
+                    f"\r\n--{boundary}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n"
+                ).encode("latin-1")
+                segments.append((part_header, start, end - start + 1))
+            trailer = f"\r\n--{boundary}--\r\n".encode("latin-1")
+            content_length = sum(len(part_header) + length for part_header, _, length in segments) + len(trailer)
+            self.send_header("Content-Length", content_length)
+            self.send_header("Content-Type", f"multipart/byteranges; boundary={boundary}")
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        return segments, trailer
+
+    def do_GET(self):
+        """Serve a GET request; send_head returns a (file, segments, trailer) tuple for ranges."""
+        source = self.send_head()
+        if source:
+            f = source[0] if isinstance(source, tuple) else source
+            try:
+                self.copyfile(source, self.wfile)
+            finally:
+                f.close()
+
     def copyfile(self, source, outputfile):
         if isinstance(source, tuple):
-            f, start, length = source
-            outputfile.write(f.read(length))
-            f.close()
+            f, segments, trailer = source
+            for part_header, start, length in segments:
+                if part_header:
+                    outputfile.write(part_header)
+                self.copy_range(f, start, length, outputfile)
+            if trailer:
+                outputfile.write(trailer)
         else:
             # Full file
             super().copyfile(source, outputfile)
 
+    @staticmethod
+    def copy_range(f, start, length, outputfile):
+        """Send length bytes of f from offset start without buffering the whole range.
+
+        Uses os.sendfile (kernel-side copy) when the output is a real socket, and falls
+        back to a bounded read/write loop otherwise.
+        """
+        try:
+            out_fd = outputfile.fileno()
+            while length > 0:
+                sent = os.sendfile(out_fd, f.fileno(), start, length)
+                if sent == 0:
+                    return  # Reached end of file
+                start += sent
+                length -= sent
+            return
+        except (AttributeError, OSError):
+            pass
+
+        f.seek(start)
+        while length > 0:
+            buf = f.read(min(COPY_CHUNK_SIZE, length))
+            if not buf:
+                break
+            outputfile.write(buf)
+            length -= len(buf)
+
     def guess_type(self, path):
-        if path.endswith(".h5ad") or path.endswith(".hdf5") or path.endswith(".h5"):
-            return "application/x-hdf5"
-        return super().guess_type(path)
+        # Memoized across requests: a remote reader asks for the same file thousands of times
+        content_type = self._content_types.get(path)
+        if content_type is None:
+            if path.endswith(HDF5_SUFFIXES):
+                content_type = "application/x-hdf5"
+            else:
+                content_type = super().guess_type(path)
+            self._content_types[path] = content_type
+        return content_type
 
 
 def main():
@@ -114,7 +234,8 @@ def main():
 
     handler = RangeHTTPRequestHandler
 
-    with socketserver.TCPServer(("", args.port), handler) as httpd:
+    # One thread per connection so concurrent Range requests are served in parallel
+    with http.server.ThreadingHTTPServer(("", args.port), handler) as httpd:
         print(f"Serving at http://localhost:{args.port}")
         print(f"Directory: {os.getcwd()}")
         print("Press Ctrl+C to stop")